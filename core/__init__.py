@@ -8,8 +8,8 @@ Module principal contenant le moteur Detectron2 et les utilitaires
 """
 
 from .detector import UniversalDetector
-from .config import ConfigManager
+from .config import ConfigManager, ConfigKeys
 from .logger import Logger
 
 __version__ = "1.0.0"
-__all__ = ["UniversalDetector", "ConfigManager", "Logger"]
+__all__ = ["UniversalDetector", "ConfigManager", "ConfigKeys", "Logger"]
@@ -8,9 +8,157 @@ Gestionnaire centralisé de configuration
 """
 
 import json
+import logging
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple, Union
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+_log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Sections exposées comme attributs de ConfigManager
+_SECTIONS = frozenset(
+    ("app", "detectron2", "ui", "logging", "performance", "paths", "api")
+)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Décode du JSON (orjson si disponible)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode en JSON indenté UTF-8 (orjson si disponible)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+# Clé de configuration : chaîne pointée ou tuple déjà découpé (voir ConfigKeys)
+ConfigKey = Union[str, Tuple[str, ...]]
+
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Découpe une clé pointée (mise en cache : les clés sont des littéraux)"""
+    return tuple(key.split("."))
+
+
+# Configuration par défaut, construite une seule fois à l'import
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "app": {
+        "name": "AIMER PRO",
+        "version": "1.0.0",
+        "description": "Application de Détection Universelle avec Detectron2",
+        "license": "Apache 2.0",
+        "author": "© 2025",
+    },
+    "detectron2": {
+        "default_task": "detection",
+        "confidence_threshold": 0.5,
+        "models": {
+            "detection": "COCO-Detection/faster_rcnn_R_50_FPN_3x.yaml",
+            "instance_segmentation": "COCO-InstanceSegmentation/mask_rcnn_R_50_FPN_3x.yaml",
+            "panoptic_segmentation": "COCO-PanopticSegmentation/panoptic_fpn_R_50_3x.yaml",
+            "keypoint_detection": "COCO-Keypoints/keypoint_rcnn_R_50_FPN_3x.yaml",
+        },
+        "device": "auto",
+        "batch_size": 1,
+    },
+    "ui": {
+        "theme": "dark",
+        "language": "fr",
+        "window": {"width": 1280, "height": 720, "resizable": True},
+        "font": {"family": "Inter", "size": 10},
+    },
+    "logging": {
+        "level": "INFO",
+        "file": "logs/aimer.log",
+        "max_size_mb": 10,
+        "backup_count": 5,
+    },
+    "performance": {
+        "gpu_optimization": True,
+        "memory_limit_gb": 4,
+        "max_concurrent_detections": 1,
+    },
+    "paths": {
+        "models": "models/",
+        "datasets": "datasets/",
+        "exports": "exports/",
+        "screenshots": "screenshots/",
+        "logs": "logs/",
+    },
+    "api": {"enabled": False, "host": "localhost", "port": 5000, "cors": True},
+}
+
+
+class ConfigKeys:
+    """Clés de configuration pré-découpées, utilisables avec get/set"""
+
+    APP_NAME = ("app", "name")
+    APP_VERSION = ("app", "version")
+
+    DETECTRON2_DEFAULT_TASK = ("detectron2", "default_task")
+    DETECTRON2_CONFIDENCE_THRESHOLD = ("detectron2", "confidence_threshold")
+    DETECTRON2_MODELS = ("detectron2", "models")
+    DETECTRON2_DEVICE = ("detectron2", "device")
+    DETECTRON2_BATCH_SIZE = ("detectron2", "batch_size")
+
+    UI_THEME = ("ui", "theme")
+    UI_LANGUAGE = ("ui", "language")
+
+    LOGGING_LEVEL = ("logging", "level")
+    LOGGING_FILE = ("logging", "file")
+
+    PERFORMANCE_GPU_OPTIMIZATION = ("performance", "gpu_optimization")
+    PERFORMANCE_MEMORY_LIMIT_GB = ("performance", "memory_limit_gb")
+    PERFORMANCE_MAX_CONCURRENT_DETECTIONS = (
+        "performance",
+        "max_concurrent_detections",
+    )
+
+    PATHS_MODELS = ("paths", "models")
+    PATHS_DATASETS = ("paths", "datasets")
+    PATHS_EXPORTS = ("paths", "exports")
+
+    API_ENABLED = ("api", "enabled")
+    API_HOST = ("api", "host")
+    API_PORT = ("api", "port")
+
+
+def _copy_tree(tree: Any) -> Any:
+    """Copie profonde d'un arbre JSON (dict/list/scalaires), sans copy.deepcopy"""
+    if tree.__class__ is dict:
+        return {key: _copy_tree(value) for key, value in tree.items()}
+    if tree.__class__ is list:
+        return [_copy_tree(value) for value in tree]
+    return tree
+
+
+def _deep_update(base_dict: Dict, update_dict: Dict) -> Dict:
+    """Mise à jour récursive des dictionnaires"""
+    for key, value in update_dict.items():
+        current = base_dict.get(key)
+        # Test d'identité de classe : plus rapide qu'isinstance sur ce chemin
+        if current.__class__ is dict and value.__class__ is dict:
+            _deep_update(current, value)
+        else:
+            base_dict[key] = value
+    return base_dict
 
 
 class ConfigManager:
@@ -24,137 +172,139 @@ class ConfigManager:
             config_path: Chemin vers le fichier de configuration
         """
         self.config_path = Path(config_path)
-        self._config = self._load_config()
+
+        # (mtime, taille) du fichier lu ou écrit en dernier (reload_if_changed)
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        # Chargement différé au premier accès (voir _cfg)
+        self._config: Optional[Dict[str, Any]] = None
+
+    @property
+    def _cfg(self) -> Dict[str, Any]:
+        """Configuration en mémoire, chargée depuis le fichier au premier accès"""
+        config = self._config
+        if config is None:
+            config = self._config = self._load_config()
+            self._rebuild_index()
+        return config
+
+    def __getattr__(self, name: str) -> Any:
+        """Déclenche le chargement lors du premier accès à une section"""
+        if name in _SECTIONS and self.__dict__.get("_config") is None:
+            self._cfg
+            return self.__dict__[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def _rebuild_index(self) -> None:
+        """Relie les sections après chargement/modification"""
+        # Sections pré-liées : les accesseurs get_*_config deviennent un
+        # simple accès d'attribut
+        config = self._config
+        self.app: Dict[str, Any] = config.get("app", {})
+        self.detectron2: Dict[str, Any] = config.get("detectron2", {})
+        self.ui: Dict[str, Any] = config.get("ui", {})
+        self.logging: Dict[str, Any] = config.get("logging", {})
+        self.performance: Dict[str, Any] = config.get("performance", {})
+        self.paths: Dict[str, Any] = config.get("paths", {})
+        self.api: Dict[str, Any] = config.get("api", {})
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        """(mtime, taille) du fichier de configuration, None s'il est absent"""
+        try:
+            st = self.config_path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
 
     def _load_config(self) -> Dict[str, Any]:
         """Charge la configuration depuis le fichier JSON"""
-        if not self.config_path.exists():
+        # Empreinte prise avant la lecture : une écriture concurrente sera vue
+        # comme un changement par reload_if_changed
+        self._file_stamp = self._file_stat()
+        if self._file_stamp is None:
             return self._get_default_config()
 
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Erreur chargement config: {e}")
+            return _json_loads(self.config_path.read_bytes())
+        except (json.JSONDecodeError, IOError):
+            _log.exception("Erreur chargement config: %s", self.config_path)
             return self._get_default_config()
 
     def _get_default_config(self) -> Dict[str, Any]:
         """Configuration par défaut"""
-        return {
-            "app": {
-                "name": "AIMER PRO",
-                "version": "1.0.0",
-                "description": "Application de Détection Universelle avec Detectron2",
-                "license": "Apache 2.0",
-                "author": "© 2025",
-            },
-            "detectron2": {
-                "default_task": "detection",
-                "confidence_threshold": 0.5,
-                "models": {
-                    "detection": "COCO-Detection/faster_rcnn_R_50_FPN_3x.yaml",
-                    "instance_segmentation": "COCO-InstanceSegmentation/mask_rcnn_R_50_FPN_3x.yaml",
-                    "panoptic_segmentation": "COCO-PanopticSegmentation/panoptic_fpn_R_50_3x.yaml",
-                    "keypoint_detection": "COCO-Keypoints/keypoint_rcnn_R_50_FPN_3x.yaml",
-                },
-                "device": "auto",
-                "batch_size": 1,
-            },
-            "ui": {
-                "theme": "dark",
-                "language": "fr",
-                "window": {"width": 1280, "height": 720, "resizable": True},
-                "font": {"family": "Inter", "size": 10},
-            },
-            "logging": {
-                "level": "INFO",
-                "file": "logs/aimer.log",
-                "max_size_mb": 10,
-                "backup_count": 5,
-            },
-            "performance": {
-                "gpu_optimization": True,
-                "memory_limit_gb": 4,
-                "max_concurrent_detections": 1,
-            },
-            "paths": {
-                "models": "models/",
-                "datasets": "datasets/",
-                "exports": "exports/",
-                "screenshots": "screenshots/",
-                "logs": "logs/",
-            },
-            "api": {"enabled": False, "host": "localhost", "port": 5000, "cors": True},
-        }
-
-    def get(self, key: str, default: Any = None) -> Any:
+        return _copy_tree(_DEFAULT_CONFIG)
+
+    def get(self, key: ConfigKey, default: Any = None) -> Any:
         """
         Récupère une valeur de configuration
 
         Args:
-            key: Clé de configuration (support notation pointée ex: "detectron2.confidence_threshold")
+            key: Clé de configuration (notation pointée ex: "detectron2.confidence_threshold"
+                 ou tuple pré-découpé ex: ConfigKeys.DETECTRON2_CONFIDENCE_THRESHOLD)
             default: Valeur par défaut si clé non trouvée
 
         Returns:
             Valeur de configuration ou default
         """
-        keys = key.split(".")
-        value = self._config
-
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
-
-    def set(self, key: str, value: Any) -> None:
+        # Parcours de l'arbre vivant : seules les clés découpées sont mises
+        # en cache, les modifications faites via les dicts retournés restent
+        # visibles
+        value = self._cfg
+        for k in key if key.__class__ is tuple else _split_key(key):
+            if value.__class__ is not dict:
+                return default
+            value = value.get(k, _MISSING)
+            if value is _MISSING:
+                return default
+        return value
+
+    def set(self, key: ConfigKey, value: Any) -> None:
         """
         Définit une valeur de configuration
 
         Args:
-            key: Clé de configuration (support notation pointée)
+            key: Clé de configuration (notation pointée ou tuple ConfigKeys)
             value: Nouvelle valeur
         """
-        keys = key.split(".")
-        config = self._config
+        keys = key if key.__class__ is tuple else _split_key(key)
+        config = self._cfg
 
         # Naviguer jusqu'au parent de la clé finale
         for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
+            config = config.setdefault(k, {})
 
         # Définir la valeur finale
         config[keys[-1]] = value
+        self._rebuild_index()
 
     def get_app_config(self) -> Dict[str, Any]:
         """Récupère la configuration de l'application"""
-        return self._config.get("app", {})
+        return self.app
 
     def get_detectron2_config(self) -> Dict[str, Any]:
         """Récupère la configuration Detectron2"""
-        return self._config.get("detectron2", {})
+        return self.detectron2
 
     def get_ui_config(self) -> Dict[str, Any]:
         """Récupère la configuration UI"""
-        return self._config.get("ui", {})
+        return self.ui
 
     def get_logging_config(self) -> Dict[str, Any]:
         """Récupère la configuration de logging"""
-        return self._config.get("logging", {})
+        return self.logging
 
     def get_performance_config(self) -> Dict[str, Any]:
         """Récupère la configuration de performance"""
-        return self._config.get("performance", {})
+        return self.performance
 
     def get_paths_config(self) -> Dict[str, Any]:
         """Récupère la configuration des chemins"""
-        return self._config.get("paths", {})
+        return self.paths
 
     def get_api_config(self) -> Dict[str, Any]:
         """Récupère la configuration API"""
-        return self._config.get("api", {})
+        return self.api
 
     def save_config(self) -> bool:
         """
@@ -163,21 +313,63 @@ class ConfigManager:
         Returns:
             True si succès, False sinon
         """
+        # Écriture dans un fichier temporaire puis renommage atomique :
+        # un crash en cours d'écriture ne laisse jamais de config tronquée
+        tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
         try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(self._config, f, indent=2, ensure_ascii=False)
-            return True
-        except IOError as e:
-            print(f"Erreur sauvegarde config: {e}")
+            tmp_path.write_bytes(_json_dumps(self._cfg))
+            os.replace(tmp_path, self.config_path)
+        except IOError:
+            _log.exception("Erreur sauvegarde config: %s", self.config_path)
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
             return False
 
+        # Le fichier reflète désormais l'état en mémoire
+        self._file_stamp = self._file_stat()
+        return True
+
     def reload_config(self) -> None:
         """Recharge la configuration depuis le fichier"""
+        # Relecture systématique : annule toutes les modifications en mémoire
         self._config = self._load_config()
+        self._rebuild_index()
 
-    def get_full_config(self) -> Dict[str, Any]:
-        """Récupère la configuration complète"""
-        return self._config.copy()
+    def reload_if_changed(self) -> bool:
+        """
+        Recharge la configuration si le fichier a changé depuis sa dernière
+        lecture ou sauvegarde (comparaison mtime/taille, sans lecture)
+
+        Returns:
+            True si la configuration a été relue, False sinon
+        """
+        if self._config is not None and self._file_stat() == self._file_stamp:
+            return False
+        self.reload_config()
+        return True
+
+    def get_full_config(
+        self, copy: bool = False, view: bool = False
+    ) -> Union[Dict[str, Any], Mapping[str, Any]]:
+        """
+        Récupère la configuration complète
+
+        Args:
+            copy: True pour obtenir une copie profonde (sections comprises)
+            view: True pour obtenir une vue sans copie, en lecture seule au
+                premier niveau seulement (non sérialisable par json.dumps)
+
+        Returns:
+            Copie superficielle (dict) par défaut, copie profonde si copy=True,
+            vue MappingProxyType si view=True
+        """
+        if copy:
+            return _copy_tree(self._cfg)
+        if view:
+            return MappingProxyType(self._cfg)
+        return self._cfg.copy()
 
     def update_config(self, new_config: Dict[str, Any]) -> None:
         """
@@ -186,18 +378,5 @@ class ConfigManager:
         Args:
             new_config: Nouvelle configuration (fusion avec l'existante)
         """
-
-        def deep_update(base_dict: Dict, update_dict: Dict) -> Dict:
-            """Mise à jour récursive des dictionnaires"""
-            for key, value in update_dict.items():
-                if (
-                    key in base_dict
-                    and isinstance(base_dict[key], dict)
-                    and isinstance(value, dict)
-                ):
-                    deep_update(base_dict[key], value)
-                else:
-                    base_dict[key] = value
-            return base_dict
-
-        deep_update(self._config, new_config)
+        _deep_update(self._cfg, new_config)
+        self._rebuild_index()
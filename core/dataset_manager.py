@@ -9,21 +9,163 @@ Gestionnaire complet pour téléchargement et gestion des datasets
 
 import os
 import json
+import mmap
 import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import zipfile
 import tarfile
 import shutil
+import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Iterator
 from urllib.parse import urlparse
 import hashlib
 import time
-from dataclasses import dataclass, asdict
+import weakref
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
 
 from .logger import Logger
 
+try:
+    import blake3
+
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+    # Le backend pur Python est bien plus lent qu'une analyse complète
+    IJSON_NATIVE = ijson.backend != "python"
+except ImportError:
+    IJSON_AVAILABLE = False
+    IJSON_NATIVE = False
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+def _json_loads(data) -> Any:
+    """Décode du JSON, str ou bytes (orjson si disponible)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Encode en JSON compact pour stockage en base (orjson si disponible)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+# Taille des lectures réseau/disque (1 Mio) et intervalle minimal entre deux
+# notifications de progression
+_CHUNK_SIZE = 1 << 20
+_PROGRESS_INTERVAL = 0.25
+
+# Téléchargement segmenté : nombre de connexions et taille minimale du fichier
+_PARALLEL_CONNECTIONS = 8
+_PARALLEL_MIN_SIZE = 64 << 20
+# Taille maximale d'un segment : unité de travail des connexions et de reprise
+_PARALLEL_SEGMENT_SIZE = 32 << 20
+# Nouveaux essais d'un segment en échec (erreur 5xx, connexion coupée...)
+_SEGMENT_RETRIES = 3
+_SEGMENT_RETRY_DELAY = 1.0
+
+# Checksum par projection mémoire au-delà de cette taille, par tranches de 16 Mio
+_MMAP_MIN_SIZE = 16 << 20
+_MMAP_SLICE = 16 << 20
+
+# Durée de validité des tailles de dossiers en cache (get_storage_stats)
+_STORAGE_STATS_TTL = 60.0
+
+# ioctl Linux de clonage copy-on-write (btrfs, xfs, ...)
+_FICLONE = 0x40049409
+
+
+def _fadvise_sequential(f) -> None:
+    """Annonce au noyau un accès séquentiel au fichier (lecture anticipée élargie)"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _reflink_or_copy(src: str, dst: str) -> str:
+    """Clone un fichier en copy-on-write si le système le permet, sinon le copie"""
+    if FCNTL_AVAILABLE:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+
+class _RangeNotSupported(IOError):
+    """Le serveur ignore l'en-tête Range (réponse 200 au lieu de 206)"""
+
+
+def _close_resources(conn: sqlite3.Connection, session: requests.Session) -> None:
+    """Ferme la connexion SQLite et la session HTTP d'un DatasetManager"""
+    conn.close()
+    session.close()
+
+
+def _segments_path(part_path: Path) -> Path:
+    """Fichier d'état des segments terminés d'un téléchargement segmenté"""
+    return part_path.with_name(part_path.name + ".segments")
+
+
+def _read_segments_state(state_path: Path) -> Optional[Dict[str, Any]]:
+    """Lit l'état d'un téléchargement segmenté (None si absent ou illisible)"""
+    try:
+        return _json_loads(state_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """Crée un lien physique, ou copie si impossible (autre disque...)"""
+    try:
+        os.link(src, dst)
+        return dst
+    except OSError:
+        return _reflink_or_copy(src, dst)
+
+
+# Réglages SQLite propres à chaque connexion (non persistés dans le fichier) :
+# une seule synchronisation disque par transaction en WAL, tables temporaires
+# en mémoire, ~20 Mo de cache de pages et base lue via mmap
+_SQLITE_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -20000;
+    PRAGMA mmap_size = 268435456;
+"""
+
 
 @dataclass
 class DatasetInfo:
@@ -40,6 +182,8 @@ class DatasetInfo:
     url: str
     format: str  # coco, pascal_voc, etc.
     checksum: Optional[str] = None
+    checksum_algo: str = "md5"  # md5, sha256, blake3...
+    blake3_checksum: Optional[str] = None  # prioritaire si blake3 est installé
     is_downloaded: bool = False
     download_date: Optional[str] = None
     local_path: Optional[str] = None
@@ -82,6 +226,29 @@ class DatasetManager:
     - Cache et métadonnées
     """
 
+    # Requêtes des chemins fréquents : texte identique à chaque appel, donc
+    # compilées une seule fois par le cache de requêtes de la connexion
+    _SQL_IS_DOWNLOADED = "SELECT is_downloaded FROM datasets WHERE id = ?"
+    _SQL_MARK_DOWNLOADED = (
+        "UPDATE datasets SET is_downloaded = TRUE, download_date = ?, local_path = ? "
+        "WHERE id = ?"
+    )
+    _SQL_SELECT_DATASETS = (
+        "SELECT id, name, description, size_mb, num_images, num_classes, tasks, "
+        "license, url, format, checksum, is_downloaded, download_date, local_path "
+        "FROM datasets"
+    )
+    # Compteur incrémenté à chaque modification de la table datasets, y compris
+    # par un autre processus : sert à invalider le cache de get_available_datasets
+    _SQL_DATA_VERSION = "SELECT value FROM meta WHERE key = 'data_version'"
+    _SQL_BUMP_DATA_VERSION = (
+        "INSERT INTO meta (key, value) VALUES ('data_version', 1) "
+        "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+    )
+    _SQL_INSERT_HISTORY = (
+        "INSERT INTO download_history (dataset_id, action, details) VALUES (?, ?, ?)"
+    )
+
     def __init__(self, base_path: str = "datasets"):
         self.logger = Logger("DatasetManager")
         self.base_path = Path(base_path)
@@ -93,18 +260,73 @@ class DatasetManager:
         for path in [self.downloaded_path, self.personal_path, self.cache_path]:
             path.mkdir(parents=True, exist_ok=True)
 
+        # Session HTTP partagée (keep-alive entre téléchargements)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # Base de données SQLite
         self.db_path = self.base_path / "datasets.db"
+        self._db_lock = threading.RLock()
+        self._conn = self._connect()
         self._init_database()
 
+        # Fermeture à la collecte de l'objet ou à la sortie de l'interpréteur,
+        # sans référence forte vers self
+        self._finalizer = weakref.finalize(
+            self, _close_resources, self._conn, self.session
+        )
+
+        # Tailles (octets) de downloaded/personal/cache, calculées par
+        # get_storage_stats puis tenues à jour à chaque opération ; recalculées
+        # après _STORAGE_STATS_TTL pour rattraper toute dérive
+        self._sizes_lock = threading.Lock()
+        self._cached_sizes: Optional[Dict[str, int]] = None
+        self._cached_sizes_time = 0.0
+
+        # Liste des datasets en cache et data_version correspondant
+        self._datasets_cache: Optional[List[DatasetInfo]] = None
+        self._datasets_cache_version: Optional[Any] = None
+
         # Datasets disponibles
         self.available_datasets = self._load_available_datasets()
 
         self.logger.info(f"DatasetManager initialisé - Base: {self.base_path}")
 
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre la connexion SQLite partagée, configurée pour les performances"""
+        # Mode autocommit : les transactions sont délimitées par _transaction()
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        conn.executescript(_SQLITE_CONNECTION_PRAGMAS)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Connexion partagée verrouillée, dans une transaction explicite"""
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        """Ferme la connexion à la base et la session HTTP"""
+        with self._db_lock:
+            self._finalizer()
+
     def _init_database(self):
         """Initialise la base de données SQLite"""
-        with sqlite3.connect(self.db_path) as conn:
+        # Journal WAL : persisté dans l'en-tête du fichier (plus de journal de
+        # rollback à synchroniser) ; ne peut pas être changé en transaction
+        self._conn.execute("PRAGMA journal_mode = WAL")
+
+        with self._transaction() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS datasets (
@@ -155,6 +377,31 @@ class DatasetManager:
             """
             )
 
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """
+            )
+
+            # Index des recherches fréquentes : datasets téléchargés (index
+            # partiel, seules les lignes concernées sont indexées) et
+            # historique trié par date
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_datasets_downloaded
+                ON datasets(name) WHERE is_downloaded = 1
+            """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_history_timestamp
+                ON download_history(timestamp DESC)
+            """
+            )
+
     def _load_available_datasets(self) -> Dict[str, DatasetInfo]:
         """Charge la liste des datasets disponibles"""
         datasets = {
@@ -232,37 +479,66 @@ class DatasetManager:
 
     def _update_database_datasets(self, datasets: Dict[str, DatasetInfo]):
         """Met à jour la base de données avec les datasets disponibles"""
-        with sqlite3.connect(self.db_path) as conn:
-            for dataset in datasets.values():
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO datasets
-                    (id, name, description, size_mb, num_images, num_classes,
-                     tasks, license, url, format, checksum)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        dataset.id,
-                        dataset.name,
-                        dataset.description,
-                        dataset.size_mb,
-                        dataset.num_images,
-                        dataset.num_classes,
-                        json.dumps(dataset.tasks),
-                        dataset.license,
-                        dataset.url,
-                        dataset.format,
-                        dataset.checksum,
-                    ),
-                )
-
-    def get_available_datasets(self) -> List[DatasetInfo]:
-        """Retourne la liste des datasets disponibles"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
+        rows = [
+            (
+                dataset.id,
+                dataset.name,
+                dataset.description,
+                dataset.size_mb,
+                dataset.num_images,
+                dataset.num_classes,
+                _json_dumps(dataset.tasks),
+                dataset.license,
+                dataset.url,
+                dataset.format,
+                dataset.checksum,
+            )
+            for dataset in datasets.values()
+        ]
+
+        # Catalogue inchangé depuis le dernier démarrage : aucune écriture
+        seed_hash = hashlib.sha1(_json_dumps(rows).encode("utf-8")).hexdigest()
+        with self._db_lock:
+            stored = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'seed_hash'"
+            ).fetchone()
+        if stored and stored[0] == seed_hash:
+            return
+
+        # Une seule requête préparée, liée N fois, dans une seule transaction.
+        # L'upsert conserve l'état de téléchargement des lignes existantes.
+        with self._transaction() as conn:
+            conn.executemany(
                 """
-                SELECT * FROM datasets ORDER BY name
-            """
+                INSERT INTO datasets
+                (id, name, description, size_mb, num_images, num_classes,
+                 tasks, license, url, format, checksum)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name,
+                    description = excluded.description,
+                    size_mb = excluded.size_mb,
+                    num_images = excluded.num_images,
+                    num_classes = excluded.num_classes,
+                    tasks = excluded.tasks,
+                    license = excluded.license,
+                    url = excluded.url,
+                    format = excluded.format,
+                    checksum = excluded.checksum
+            """,
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('seed_hash', ?)",
+                (seed_hash,),
+            )
+            conn.execute(self._SQL_BUMP_DATA_VERSION)
+
+    def _query_datasets(self, where: str = "") -> List[DatasetInfo]:
+        """Charge les datasets de la base (filtre SQL optionnel), triés par nom"""
+        with self._db_lock:
+            cursor = self._conn.execute(
+                f"{self._SQL_SELECT_DATASETS} {where} ORDER BY name"
             )
 
             datasets = []
@@ -274,7 +550,7 @@ class DatasetManager:
                     size_mb=row[3],
                     num_images=row[4],
                     num_classes=row[5],
-                    tasks=json.loads(row[6]),
+                    tasks=_json_loads(row[6]),
                     license=row[7],
                     url=row[8],
                     format=row[9],
@@ -287,9 +563,26 @@ class DatasetManager:
 
             return datasets
 
+    def get_available_datasets(self) -> List[DatasetInfo]:
+        """
+        Retourne la liste des datasets disponibles (en cache tant que inchangée)
+
+        Les objets retournés sont des copies : les modifier n'altère pas le cache.
+        """
+        with self._db_lock:
+            row = self._conn.execute(self._SQL_DATA_VERSION).fetchone()
+            version = row[0] if row else None
+            if self._datasets_cache is None or version != self._datasets_cache_version:
+                self._datasets_cache = self._query_datasets()
+                self._datasets_cache_version = version
+            return [
+                replace(dataset, tasks=list(dataset.tasks))
+                for dataset in self._datasets_cache
+            ]
+
     def get_downloaded_datasets(self) -> List[DatasetInfo]:
         """Retourne la liste des datasets téléchargés"""
-        return [ds for ds in self.get_available_datasets() if ds.is_downloaded]
+        return self._query_datasets("WHERE is_downloaded = 1")
 
     def download_dataset(
         self, dataset_id: str, progress_callback: Optional[Callable] = None
@@ -328,10 +621,14 @@ class DatasetManager:
 
         self.logger.info(f"Début téléchargement: {dataset.name}")
 
+        # Dossier de destination
+        dataset_dir = self.downloaded_path / dataset_id
+        started = time.monotonic()
+        size_before = None
+
         try:
-            # Dossier de destination
-            dataset_dir = self.downloaded_path / dataset_id
             dataset_dir.mkdir(exist_ok=True)
+            size_before = self._dir_size(dataset_dir)
 
             # Nom du fichier
             filename = Path(urlparse(dataset.url).path).name
@@ -340,19 +637,31 @@ class DatasetManager:
 
             file_path = dataset_dir / filename
 
-            # Téléchargement avec progression
-            success = self._download_file(dataset.url, file_path, progress_callback)
+            # Checksum si disponible (BLAKE3 en priorité : hachage arborescent,
+            # parallélisé sur tous les cœurs)
+            if dataset.blake3_checksum and BLAKE3_AVAILABLE:
+                checksum, algo = dataset.blake3_checksum, "blake3"
+            else:
+                checksum, algo = dataset.checksum, dataset.checksum_algo
+
+            hasher = None
+            if checksum:
+                hasher = self._new_hasher(algo)
+                if hasher is None:
+                    return False
+
+            # Téléchargement avec progression, le checksum est calculé au vol
+            success = self._download_file(
+                dataset.url, file_path, progress_callback, hasher
+            )
 
             if success:
-                # Vérification checksum si disponible
-                if dataset.checksum and not self._verify_checksum(
-                    file_path, dataset.checksum
-                ):
+                if hasher is not None and hasher.hexdigest() != checksum:
                     self.logger.error(f"Checksum invalide pour {dataset_id}")
                     return False
 
                 # Extraction si nécessaire
-                if filename.endswith((".zip", ".tar", ".tar.gz")):
+                if filename.endswith((".zip", ".tar", ".tar.gz", ".tgz")):
                     self._extract_archive(file_path, dataset_dir, progress_callback)
 
                 # Mise à jour base de données
@@ -370,34 +679,298 @@ class DatasetManager:
                 dataset_id, "download", {"success": False, "error": str(e)}
             )
 
+        finally:
+            # Octets écrits comptés quelle que soit l'issue (échec, checksum
+            # invalide, .part conservé pour reprise)
+            if size_before is not None and self._cached_sizes is not None:
+                self._update_cached_size(
+                    "downloaded", self._dir_size(dataset_dir) - size_before, started
+                )
+
         return False
 
     def _download_file(
-        self, url: str, file_path: Path, progress_callback: Optional[Callable] = None
+        self,
+        url: str,
+        file_path: Path,
+        progress_callback: Optional[Callable] = None,
+        hasher: Optional[Any] = None,
     ) -> bool:
-        """Télécharge un fichier avec suivi de progression"""
+        """
+        Télécharge un fichier avec suivi de progression
+
+        Args:
+            url: URL du fichier
+            file_path: Chemin de destination
+            progress_callback: Fonction de callback pour la progression
+            hasher: Objet de hachage (voir _new_hasher) alimenté avec le
+                contenu téléchargé, pour éviter une relecture du fichier
+        """
+        # Écriture dans un fichier .part, renommé seulement une fois complet :
+        # un téléchargement interrompu reprend là où il s'était arrêté
+        part_path = file_path.with_name(file_path.name + ".part")
+        try:
+            resume_from = part_path.stat().st_size
+        except OSError:
+            resume_from = 0
+
+        # .part pré-alloué par le mode segmenté : sa taille n'est pas un
+        # offset de reprise, les segments manquants sont repris par ce mode
+        if _segments_path(part_path).exists():
+            resume_from = 0
+
         try:
-            response = requests.get(url, stream=True)
+            # Gros fichiers : plusieurs connexions en parallèle si le serveur
+            # accepte les requêtes partielles. Les segments arrivent dans le
+            # désordre : le checksum est alors calculé sur le fichier complet.
+            if not resume_from and self._download_file_parallel(
+                url, part_path, progress_callback
+            ):
+                if hasher is not None:
+                    self._hash_file(part_path, hasher)
+                os.replace(part_path, file_path)
+                return True
+
+            headers = {"Range": f"bytes={resume_from}-"} if resume_from else {}
+            response = self.session.get(url, stream=True, headers=headers)
+            if response.status_code == 416:
+                # Plage refusée (fichier distant modifié ?) : on repart de zéro
+                response.close()
+                response = self.session.get(url, stream=True)
             response.raise_for_status()
 
             total_size = int(response.headers.get("content-length", 0))
-            downloaded = 0
+            if resume_from and response.status_code == 206:
+                # Reprise : le début déjà reçu est haché depuis le disque
+                if hasher is not None:
+                    self._hash_file(part_path, hasher)
+                mode = "ab"
+                downloaded = resume_from
+                total_size += resume_from
+                self.logger.info(f"Reprise du téléchargement à {resume_from} octets")
+            else:
+                mode = "wb"
+                downloaded = 0
 
             callback = ProgressCallback(progress_callback)
-
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
+            last_update = 0.0
+
+            # Lecture directe du flux brut par blocs de 1 Mio : beaucoup moins
+            # d'itérations Python qu'iter_content(8192)
+            raw = response.raw
+            raw.decode_content = True
+            with open(part_path, mode) as f:
+                _fadvise_sequential(f)
+                while True:
+                    chunk = raw.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    downloaded += len(chunk)
+
+                    now = time.monotonic()
+                    if now - last_update >= _PROGRESS_INTERVAL:
+                        last_update = now
                         callback.update(downloaded, total_size, "Téléchargement...")
 
+            callback.update(downloaded, total_size, "Téléchargement...")
+
+            os.replace(part_path, file_path)
             return True
 
         except Exception as e:
             self.logger.error(f"Erreur téléchargement {url}: {e}")
             return False
 
+    def _download_file_parallel(
+        self,
+        url: str,
+        file_path: Path,
+        progress_callback: Optional[Callable] = None,
+        num_conns: int = _PARALLEL_CONNECTIONS,
+    ) -> bool:
+        """
+        Télécharge un fichier par segments (requêtes Range) sur plusieurs connexions
+
+        Le fichier est découpé en segments d'au plus 32 Mio, répartis entre
+        num_conns connexions ; chaque segment est écrit à son offset dans un
+        fichier pré-alloué. Les segments terminés sont notés dans un fichier
+        .segments voisin : après une interruption, seuls les segments manquants
+        sont retéléchargés (au plus 32 Mio perdus par connexion).
+
+        Un segment en échec est retenté jusqu'à _SEGMENT_RETRIES fois, en
+        reprenant à l'octet atteint. S'il échoue encore, l'exception remonte
+        et le .part est conservé avec son état pour une reprise ultérieure.
+
+        Returns:
+            bool: True si le fichier a été téléchargé, False si le mode segmenté
+            ne s'applique pas (serveur sans Range, fichier trop petit...) ou si
+            le serveur ignore Range en pratique : le fichier est alors supprimé
+            pour laisser place au téléchargement en flux unique
+        """
+        state_path = _segments_path(file_path)
+        state = _read_segments_state(state_path)
+
+        head = None
+        if hasattr(os, "pwrite"):
+            head = self.session.head(url, allow_redirects=True)
+        total_size = int(head.headers.get("content-length", 0)) if head else 0
+        if (
+            head is None
+            or head.status_code != 200
+            or head.headers.get("accept-ranges", "").lower() != "bytes"
+            or head.headers.get("content-encoding")
+            or total_size < _PARALLEL_MIN_SIZE
+        ):
+            if state_path.exists():
+                # Reprise segmentée impossible : le .part pré-alloué est inutilisable
+                file_path.unlink(missing_ok=True)
+                state_path.unlink(missing_ok=True)
+            return False
+
+        # Segments de taille fixe tirés par le pool : ils se terminent au fil
+        # du téléchargement et l'avancement enregistré suit la progression
+        segment_size = min(_PARALLEL_SEGMENT_SIZE, -(-total_size // num_conns))
+        segments = [
+            (start, min(start + segment_size, total_size) - 1)
+            for start in range(0, total_size, segment_size)
+        ]
+
+        # Reprise : état cohérent avec le fichier distant et .part présent
+        completed = set()
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        if (
+            state is not None
+            and state.get("total") == total_size
+            and state.get("segment_size") == segment_size
+            and file_path.exists()
+        ):
+            completed = {start for start, _ in segments} & set(state["done"])
+            flags = os.O_WRONLY
+            self.logger.info(
+                f"Reprise du téléchargement segmenté "
+                f"({len(completed)}/{len(segments)} segments présents)"
+            )
+        state = {"total": total_size, "segment_size": segment_size, "done": []}
+        state["done"] = sorted(completed)
+        # L'état est écrit avant la pré-allocation : un .part pré-alloué est
+        # toujours accompagné de son fichier .segments
+        state_path.write_text(_json_dumps(state))
+
+        callback = ProgressCallback(progress_callback)
+        progress_lock = threading.Lock()
+        downloaded = sum(
+            end - start + 1 for start, end in segments if start in completed
+        )
+        progress = {"downloaded": downloaded, "last_update": 0.0}
+        # Levé au premier segment en échec définitif : les autres s'interrompent
+        abort = threading.Event()
+
+        def fetch_range(position: List[int], end: int):
+            """Télécharge position[0]..end, position[0] suit l'octet atteint"""
+            headers = {"Range": f"bytes={position[0]}-{end}"}
+            with self.session.get(url, stream=True, headers=headers) as response:
+                if response.status_code == 200:
+                    raise _RangeNotSupported(
+                        f"Réponse 200 pour la plage {position[0]}-{end}"
+                    )
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise IOError(
+                        f"Réponse {response.status_code} pour la plage "
+                        f"{position[0]}-{end}"
+                    )
+
+                raw = response.raw
+                while not abort.is_set():
+                    chunk = raw.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    view = memoryview(chunk)
+                    while view:
+                        written = os.pwrite(fd, view, position[0])
+                        view = view[written:]
+                        position[0] += written
+
+                    with progress_lock:
+                        progress["downloaded"] += len(chunk)
+                        now = time.monotonic()
+                        if now - progress["last_update"] >= _PROGRESS_INTERVAL:
+                            progress["last_update"] = now
+                            callback.update(
+                                progress["downloaded"], total_size, "Téléchargement..."
+                            )
+
+            if position[0] != end + 1 and not abort.is_set():
+                raise IOError(f"Plage {position[0]}-{end} incomplète")
+
+        def fetch_segment(start: int, end: int):
+            position = [start]
+            for attempt in range(_SEGMENT_RETRIES + 1):
+                try:
+                    fetch_range(position, end)
+                    break
+                except _RangeNotSupported:
+                    raise
+                except Exception as e:
+                    if abort.is_set() or attempt == _SEGMENT_RETRIES:
+                        raise
+                    self.logger.warning(
+                        f"Segment {start}-{end} en échec ({e}), nouvel essai"
+                    )
+                    time.sleep(_SEGMENT_RETRY_DELAY * (attempt + 1))
+
+            if abort.is_set():
+                return
+
+            # Segment sur disque avant d'être noté comme terminé
+            os.fsync(fd)
+            with progress_lock:
+                state["done"].append(start)
+                state_path.write_text(_json_dumps(state))
+
+        error = None
+        fd = os.open(file_path, flags, 0o644)
+        try:
+            os.ftruncate(fd, total_size)
+            with ThreadPoolExecutor(max_workers=num_conns) as executor:
+                futures = [
+                    executor.submit(fetch_segment, start, end)
+                    for start, end in segments
+                    if start not in completed
+                ]
+                done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+                if pending:
+                    # Échec d'un segment : on annule ceux en attente et on
+                    # interrompt ceux en cours au lieu de les laisser finir
+                    abort.set()
+                    for future in pending:
+                        future.cancel()
+                for future in done:
+                    future.result()
+        except Exception as e:
+            error = e
+        finally:
+            os.close(fd)
+
+        if isinstance(error, _RangeNotSupported):
+            self.logger.warning(
+                f"Téléchargement segmenté abandonné ({error}), passage en flux unique"
+            )
+            file_path.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            return False
+        if error is not None:
+            # Segments terminés conservés : la prochaine tentative les reprend
+            raise error
+
+        state_path.unlink(missing_ok=True)
+
+        callback.update(total_size, total_size, "Téléchargement...")
+        return True
+
     def _extract_archive(
         self,
         archive_path: Path,
@@ -418,12 +991,19 @@ class DatasetManager:
                     }
                 )
 
-            if archive_path.suffix == ".zip":
+            name = archive_path.name.lower()
+            if name.endswith(".zip"):
                 with zipfile.ZipFile(archive_path, "r") as zip_ref:
                     zip_ref.extractall(extract_dir)
-            elif archive_path.suffix in [".tar", ".gz"]:
-                with tarfile.open(archive_path, "r:*") as tar_ref:
-                    tar_ref.extractall(extract_dir)
+            elif name.endswith((".tar.gz", ".tgz")) and self._extract_with_pigz(
+                archive_path, extract_dir
+            ):
+                pass
+            elif name.endswith((".tar", ".gz", ".tgz")):
+                with open(archive_path, "rb") as f:
+                    _fadvise_sequential(f)
+                    with tarfile.open(fileobj=f, mode="r:*") as tar_ref:
+                        tar_ref.extractall(extract_dir)
 
             # Suppression de l'archive après extraction
             archive_path.unlink()
@@ -443,15 +1023,98 @@ class DatasetManager:
         except Exception as e:
             self.logger.error(f"Erreur extraction {archive_path}: {e}")
 
-    def _verify_checksum(self, file_path: Path, expected_checksum: str) -> bool:
-        """Vérifie le checksum MD5 d'un fichier"""
+    def _extract_with_pigz(self, archive_path: Path, extract_dir: Path) -> bool:
+        """
+        Extrait un .tar.gz avec tar + pigz (décompression gzip multi-cœurs)
+
+        Returns:
+            bool: True si extrait, False si tar/pigz indisponibles ou en échec
+            (l'appelant se replie alors sur tarfile)
+        """
+        tar = shutil.which("tar")
+        pigz = shutil.which("pigz")
+        if not (tar and pigz):
+            return False
+
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
+            subprocess.run(
+                [
+                    tar,
+                    "--use-compress-program=pigz",
+                    "-xf",
+                    str(archive_path),
+                    "-C",
+                    str(extract_dir),
+                ],
+                check=True,
+                capture_output=True,
+            )
+            return True
+        except (subprocess.CalledProcessError, OSError) as e:
+            self.logger.warning(f"Extraction pigz échouée, repli sur tarfile: {e}")
+            return False
 
-            return hash_md5.hexdigest() == expected_checksum
+    def _new_hasher(self, algo: str) -> Optional[Any]:
+        """Crée l'objet de hachage pour un algorithme (None si indisponible)"""
+        if algo == "blake3":
+            if not BLAKE3_AVAILABLE:
+                self.logger.error(
+                    "blake3 requis pour vérifier ce checksum (pip install blake3)"
+                )
+                return None
+            # Arbre de Merkle : haché en parallèle par le module natif
+            return blake3.blake3(max_threads=blake3.blake3.AUTO)
+        return hashlib.new(algo)
+
+    def _hash_file(self, file_path: Path, hasher: Any):
+        """Alimente un objet de hachage avec le contenu d'un fichier"""
+        if hasattr(hasher, "update_mmap"):
+            hasher.update_mmap(file_path)
+            return
+
+        with open(file_path, "rb") as f:
+            _fadvise_sequential(f)
+            size = os.fstat(f.fileno()).st_size
+            if size >= _MMAP_MIN_SIZE:
+                # Fichier projeté en mémoire : pas de copie noyau -> Python,
+                # et le cache de pages reste chaud pour l'extraction qui suit
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    prefetch = hasattr(mmap, "MADV_WILLNEED")
+                    view = memoryview(mm)
+                    try:
+                        for offset in range(0, size, _MMAP_SLICE):
+                            # Lecture anticipée asynchrone de la tranche suivante
+                            # pendant le hachage de celle-ci : le disque reste
+                            # occupé sans attendre le défaut de page
+                            next_offset = offset + _MMAP_SLICE
+                            if prefetch and next_offset < size:
+                                mm.madvise(
+                                    mmap.MADV_WILLNEED,
+                                    next_offset,
+                                    min(_MMAP_SLICE, size - next_offset),
+                                )
+                            hasher.update(view[offset : offset + _MMAP_SLICE])
+                    finally:
+                        view.release()
+            elif hasattr(hashlib, "file_digest"):
+                # Python 3.11+ : boucle de lecture en C, GIL relâché
+                hashlib.file_digest(f, lambda: hasher)
+            else:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+
+    def _verify_checksum(
+        self, file_path: Path, expected_checksum: str, algo: str = "md5"
+    ) -> bool:
+        """Vérifie le checksum d'un fichier (MD5 par défaut)"""
+        try:
+            hasher = self._new_hasher(algo)
+            if hasher is None:
+                return False
+            self._hash_file(file_path, hasher)
+            return hasher.hexdigest() == expected_checksum
 
         except Exception as e:
             self.logger.error(f"Erreur vérification checksum: {e}")
@@ -459,27 +1122,19 @@ class DatasetManager:
 
     def _mark_as_downloaded(self, dataset_id: str, local_path: str):
         """Marque un dataset comme téléchargé"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             conn.execute(
-                """
-                UPDATE datasets
-                SET is_downloaded = TRUE, download_date = ?, local_path = ?
-                WHERE id = ?
-            """,
+                self._SQL_MARK_DOWNLOADED,
                 (datetime.now().isoformat(), local_path, dataset_id),
             )
+            conn.execute(self._SQL_BUMP_DATA_VERSION)
 
     def is_downloaded(self, dataset_id: str) -> bool:
         """Vérifie si un dataset est téléchargé"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT is_downloaded FROM datasets WHERE id = ?
-            """,
-                (dataset_id,),
-            )
-
-            result = cursor.fetchone()
+        with self._db_lock:
+            result = self._conn.execute(
+                self._SQL_IS_DOWNLOADED, (dataset_id,)
+            ).fetchone()
             return bool(result[0]) if result else False
 
     def delete_dataset(self, dataset_id: str) -> bool:
@@ -487,10 +1142,22 @@ class DatasetManager:
         try:
             dataset_dir = self.downloaded_path / dataset_id
             if dataset_dir.exists():
-                shutil.rmtree(dataset_dir)
+                started = time.monotonic()
+                size_before = (
+                    self._dir_size(dataset_dir) if self._cached_sizes is not None else 0
+                )
+                try:
+                    shutil.rmtree(dataset_dir)
+                finally:
+                    if self._cached_sizes is not None:
+                        self._update_cached_size(
+                            "downloaded",
+                            self._dir_size(dataset_dir) - size_before,
+                            started,
+                        )
 
             # Mise à jour base de données
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute(
                     """
                     UPDATE datasets
@@ -499,6 +1166,7 @@ class DatasetManager:
                 """,
                     (dataset_id,),
                 )
+                conn.execute(self._SQL_BUMP_DATA_VERSION)
 
             self._add_to_history(dataset_id, "delete", {"success": True})
             self.logger.info(f"Dataset {dataset_id} supprimé")
@@ -509,7 +1177,7 @@ class DatasetManager:
             return False
 
     def create_personal_dataset(
-        self, name: str, description: str, source_path: str
+        self, name: str, description: str, source_path: str, mode: str = "copy"
     ) -> Optional[str]:
         """
         Crée un dataset personnel
@@ -518,10 +1186,15 @@ class DatasetManager:
             name: Nom du dataset
             description: Description
             source_path: Chemin vers les données source
+            mode: "copy" (clone copy-on-write si possible, sinon copie) ou
+                "link" (liens physiques : aucune donnée dupliquée, mais les
+                fichiers restent partagés avec la source)
 
         Returns:
             str: ID du dataset créé, None si erreur
         """
+        started = time.monotonic()
+        size_before = None
         try:
             # Génération ID unique
             dataset_id = f"personal_{int(time.time())}"
@@ -529,19 +1202,23 @@ class DatasetManager:
             # Dossier de destination
             dataset_dir = self.personal_path / dataset_id
             dataset_dir.mkdir(exist_ok=True)
+            size_before = self._dir_size(dataset_dir)
 
             # Copie des données
+            copy_function = _link_or_copy if mode == "link" else _reflink_or_copy
             source = Path(source_path)
             if source.is_file():
-                shutil.copy2(source, dataset_dir)
+                copy_function(str(source), str(dataset_dir / source.name))
             elif source.is_dir():
-                shutil.copytree(source, dataset_dir / source.name)
+                shutil.copytree(
+                    source, dataset_dir / source.name, copy_function=copy_function
+                )
 
             # Analyse du dataset
             stats = self._analyze_personal_dataset(dataset_dir)
 
             # Sauvegarde en base
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 conn.execute(
                     """
                     INSERT INTO personal_datasets
@@ -566,39 +1243,64 @@ class DatasetManager:
             self.logger.error(f"Erreur création dataset personnel: {e}")
             return None
 
+        finally:
+            # Fichiers copiés comptés même si la création échoue ensuite
+            if size_before is not None and self._cached_sizes is not None:
+                self._update_cached_size(
+                    "personal", self._dir_size(dataset_dir) - size_before, started
+                )
+
     def _analyze_personal_dataset(self, dataset_dir: Path) -> Dict[str, Any]:
         """Analyse un dataset personnel pour extraire les statistiques"""
         stats = {"num_images": 0, "num_classes": 0, "format": "unknown"}
 
         try:
-            # Compter les images
-            image_extensions = {".jpg", ".jpeg", ".png", ".bmp", ".tiff"}
-            image_files = []
-
-            for ext in image_extensions:
-                image_files.extend(dataset_dir.rglob(f"*{ext}"))
-                image_files.extend(dataset_dir.rglob(f"*{ext.upper()}"))
-
-            stats["num_images"] = len(image_files)
+            # Un seul parcours de l'arborescence (os.scandir : le type de chaque
+            # entrée vient du readdir, sans stat par fichier)
+            image_extensions = {"jpg", "jpeg", "png", "bmp", "tiff"}
+            num_images = 0
+            has_xml = has_txt = False
+            json_files = []
+
+            pending = [str(dataset_dir)]
+            while pending:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                            continue
+                        ext = entry.name.rpartition(".")[2].lower()
+                        if ext in image_extensions:
+                            num_images += 1
+                        elif ext == "xml":
+                            has_xml = True
+                        elif ext == "txt":
+                            has_txt = True
+                        elif ext == "json":
+                            json_files.append(entry.path)
+
+            stats["num_images"] = num_images
 
             # Détecter le format
             if (dataset_dir / "annotations").exists():
                 stats["format"] = "coco"
-            elif any(dataset_dir.rglob("*.xml")):
+            elif has_xml:
                 stats["format"] = "pascal_voc"
-            elif any(dataset_dir.rglob("*.txt")):
+            elif has_txt:
                 stats["format"] = "yolo"
 
             # Compter les classes (approximatif)
             if stats["format"] == "coco":
-                # Chercher fichier annotations COCO
-                for ann_file in dataset_dir.rglob("*.json"):
+                # Chercher fichier annotations COCO (instances_*.json en premier)
+                json_files.sort(
+                    key=lambda path: not os.path.basename(path).startswith("instances_")
+                )
+                for ann_file in json_files:
                     try:
-                        with open(ann_file) as f:
-                            data = json.load(f)
-                            if "categories" in data:
-                                stats["num_classes"] = len(data["categories"])
-                                break
+                        categories = self._read_coco_categories(ann_file)
+                        if categories is not None:
+                            stats["num_classes"] = len(categories)
+                            break
                     except:
                         continue
 
@@ -607,12 +1309,27 @@ class DatasetManager:
 
         return stats
 
+    def _read_coco_categories(self, ann_file: str) -> Optional[List[Any]]:
+        """Extrait le tableau "categories" d'un fichier d'annotations COCO"""
+        with open(ann_file, "rb") as f:
+            if not ORJSON_AVAILABLE and IJSON_NATIVE:
+                # Sans orjson : analyse en flux (backend C), seul le tableau
+                # categories est construit. Il est en général la dernière clé
+                # d'un fichier COCO : le gain est en mémoire, pas en temps
+                return next(ijson.items(f, "categories"), None)
+
+            # Lecture en octets : orjson décode sans passer par str
+            data = _json_loads(f.read())
+            return data.get("categories") if isinstance(data, dict) else None
+
     def get_personal_datasets(self) -> List[Dict[str, Any]]:
         """Retourne la liste des datasets personnels"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
+        with self._db_lock:
+            cursor = self._conn.execute(
                 """
-                SELECT * FROM personal_datasets ORDER BY created_at DESC
+                SELECT id, name, description, path, num_images, num_classes,
+                       format, created_at, updated_at
+                FROM personal_datasets ORDER BY created_at DESC
             """
             )
 
@@ -636,21 +1353,19 @@ class DatasetManager:
 
     def _add_to_history(self, dataset_id: str, action: str, details: Dict[str, Any]):
         """Ajoute une entrée à l'historique"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO download_history (dataset_id, action, details)
-                VALUES (?, ?, ?)
-            """,
-                (dataset_id, action, json.dumps(details)),
+        # Une seule requête : validée immédiatement en autocommit, sous le verrou
+        with self._db_lock:
+            self._conn.execute(
+                self._SQL_INSERT_HISTORY, (dataset_id, action, _json_dumps(details))
             )
 
     def get_download_history(self) -> List[Dict[str, Any]]:
         """Retourne l'historique des téléchargements"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
+        with self._db_lock:
+            cursor = self._conn.execute(
                 """
-                SELECT * FROM download_history ORDER BY timestamp DESC LIMIT 50
+                SELECT id, dataset_id, action, timestamp, details
+                FROM download_history ORDER BY timestamp DESC LIMIT 50
             """
             )
 
@@ -662,28 +1377,81 @@ class DatasetManager:
                         "dataset_id": row[1],
                         "action": row[2],
                         "timestamp": row[3],
-                        "details": json.loads(row[4]) if row[4] else {},
+                        "details": _json_loads(row[4]) if row[4] else {},
                     }
                 )
 
             return history
 
-    def get_storage_stats(self) -> Dict[str, Any]:
-        """Retourne les statistiques de stockage"""
-
-        def get_dir_size(path: Path) -> int:
-            total = 0
+    def _dir_size(self, path: Path) -> int:
+        """Taille totale des fichiers d'une arborescence (parcours os.scandir)"""
+        total = 0
+        pending = [str(path)]
+        while pending:
             try:
-                for file_path in path.rglob("*"):
-                    if file_path.is_file():
-                        total += file_path.stat().st_size
-            except:
-                pass
-            return total
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+        return total
+
+    def _update_cached_size(self, key: str, delta: int, started: float):
+        """
+        Répercute une variation de taille sur le cache des statistiques
+
+        Args:
+            key: "downloaded", "personal" ou "cache"
+            delta: Variation en octets
+            started: Début de l'opération (time.monotonic())
+        """
+        with self._sizes_lock:
+            if self._cached_sizes is None:
+                return
+            if self._cached_sizes_time >= started:
+                # Tailles mesurées pendant l'opération : elles en contiennent
+                # déjà une partie, le prochain appel refera le parcours
+                self._cached_sizes = None
+                return
+            self._cached_sizes[key] = max(0, self._cached_sizes[key] + delta)
+
+    def _count_downloaded(self) -> int:
+        """Nombre de datasets téléchargés (servi par l'index partiel)"""
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM datasets WHERE is_downloaded = 1"
+            ).fetchone()[0]
+
+    def get_storage_stats(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Retourne les statistiques de stockage
 
-        downloaded_size = get_dir_size(self.downloaded_path)
-        personal_size = get_dir_size(self.personal_path)
-        cache_size = get_dir_size(self.cache_path)
+        Args:
+            refresh: True pour forcer un nouveau parcours des dossiers
+                (sinon les tailles en cache sont utilisées)
+        """
+        with self._sizes_lock:
+            sizes = self._cached_sizes
+            if sizes is not None:
+                age = time.monotonic() - self._cached_sizes_time
+                sizes = dict(sizes) if age < _STORAGE_STATS_TTL else None
+
+        if refresh or sizes is None:
+            sizes = {
+                "downloaded": self._dir_size(self.downloaded_path),
+                "personal": self._dir_size(self.personal_path),
+                "cache": self._dir_size(self.cache_path),
+            }
+            with self._sizes_lock:
+                self._cached_sizes = dict(sizes)
+                self._cached_sizes_time = time.monotonic()
+
+        downloaded_size = sizes["downloaded"]
+        personal_size = sizes["personal"]
+        cache_size = sizes["cache"]
 
         return {
             "downloaded_size_mb": downloaded_size / (1024 * 1024),
@@ -691,7 +1459,7 @@ class DatasetManager:
             "cache_size_mb": cache_size / (1024 * 1024),
             "total_size_mb": (downloaded_size + personal_size + cache_size)
             / (1024 * 1024),
-            "num_downloaded": len(self.get_downloaded_datasets()),
+            "num_downloaded": self._count_downloaded(),
             "num_personal": len(self.get_personal_datasets()),
         }
 
@@ -702,6 +1470,10 @@ class DatasetManager:
                 shutil.rmtree(self.cache_path)
                 self.cache_path.mkdir(exist_ok=True)
 
+            with self._sizes_lock:
+                if self._cached_sizes is not None:
+                    self._cached_sizes["cache"] = 0
+
             self.logger.info("Cache nettoyé")
 
         except Exception as e:
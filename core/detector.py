@@ -10,8 +10,11 @@ Détecteur universel unifié basé sur Detectron2
 import cv2
 import numpy as np
 import torch
+import threading
 import time
-from typing import Dict, List, Any, Optional, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence, Union
 from pathlib import Path
 import logging
 
@@ -27,9 +30,12 @@ except ImportError:
     DETECTRON2_AVAILABLE = False
     logging.warning("Detectron2 non disponible - installation requise")
 
-from .config import ConfigManager
+from .config import ConfigManager, ConfigKeys
 from .logger import Logger
 
+# Nombre de tampons en mémoire épinglée conservés (un par taille d'image)
+_PINNED_BUFFER_SLOTS = 4
+
 
 class DetectionResult:
     """Résultat de détection structuré"""
@@ -54,33 +60,39 @@ class DetectionResult:
         if not self.instances or not hasattr(self.instances, "pred_boxes"):
             return []
 
-        detections = []
         boxes = self.instances.pred_boxes.tensor.cpu().numpy()
         scores = self.instances.scores.cpu().numpy()
         classes = self.instances.pred_classes.cpu().numpy()
 
-        for i, (box, score, cls) in enumerate(zip(boxes, scores, classes)):
-            detection = {
+        # Largeurs/hauteurs calculées en une passe NumPy, puis conversion en
+        # listes Python natives : plus de float() par valeur dans la boucle
+        sizes = (boxes[:, 2:4] - boxes[:, 0:2]).tolist()
+        boxes = boxes.tolist()
+        scores = scores.tolist()
+        classes = classes.astype(int).tolist()
+        thing_classes = self.metadata.thing_classes if self.metadata else None
+
+        return [
+            {
                 "id": i,
-                "class_id": int(cls),
+                "class_id": cls,
                 "class_name": (
-                    self.metadata.thing_classes[cls]
-                    if self.metadata
-                    else f"class_{cls}"
+                    thing_classes[cls] if thing_classes is not None else f"class_{cls}"
                 ),
-                "confidence": float(score),
+                "confidence": score,
                 "bbox": {
-                    "x1": float(box[0]),
-                    "y1": float(box[1]),
-                    "x2": float(box[2]),
-                    "y2": float(box[3]),
-                    "width": float(box[2] - box[0]),
-                    "height": float(box[3] - box[1]),
+                    "x1": box[0],
+                    "y1": box[1],
+                    "x2": box[2],
+                    "y2": box[3],
+                    "width": width,
+                    "height": height,
                 },
             }
-            detections.append(detection)
-
-        return detections
+            for i, (box, score, cls, (width, height)) in enumerate(
+                zip(boxes, scores, classes, sizes)
+            )
+        ]
 
 
 class UniversalDetector:
@@ -116,10 +128,19 @@ class UniversalDetector:
             if confidence_threshold is not None
             else config.get("confidence_threshold", 0.5)
         )
+        self.batch_size = max(
+            1, int(self.config_manager.get(ConfigKeys.DETECTRON2_BATCH_SIZE, 1))
+        )
 
         self.predictor = None
         self.cfg = None
         self.metadata = None
+        self._input_format = "BGR"
+
+        # Tampons hôte en mémoire épinglée (LRU par forme) pour les copies
+        # asynchrones vers le GPU
+        self._pinned_buffers: OrderedDict = OrderedDict()
+        self._pinned_lock = threading.Lock()
 
         # Métriques de performance
         self.performance_metrics = {
@@ -156,6 +177,7 @@ class UniversalDetector:
             # Configuration Detectron2
             self.cfg = get_cfg()
             self._setup_model_config()
+            self._input_format = self.cfg.INPUT.FORMAT
 
             # Création du prédicteur
             self.predictor = DefaultPredictor(self.cfg)
@@ -205,11 +227,13 @@ class UniversalDetector:
         start_time = time.time()
 
         try:
-            # Préparation image
-            processed_image = self._prepare_image(image)
+            # Préparation image (même chemin que detect_batch : copie vers
+            # le GPU via mémoire épinglée)
+            inputs = self._prepare_batch_inputs([image])
 
             # Détection
-            instances = self.predictor(processed_image)["instances"]
+            with torch.inference_mode():
+                instances = self.predictor.model(inputs)[0]["instances"]
 
             # Calcul métriques
             inference_time = time.time() - start_time
@@ -237,6 +261,127 @@ class UniversalDetector:
             # Retourner résultat vide en cas d'erreur
             return DetectionResult(None, self.metadata, {"error": str(e)})
 
+    def detect_batch(
+        self,
+        images: Sequence[Union[np.ndarray, str, Path]],
+        batch_size: Optional[int] = None,
+    ) -> List[DetectionResult]:
+        """
+        Détection sur plusieurs images, par lots (un seul appel du modèle par lot)
+
+        La préparation du lot suivant se fait sur CPU pendant l'inférence du
+        lot courant.
+
+        Args:
+            images: Images (arrays numpy, chemins fichier, ou Path)
+            batch_size: Taille des lots (défaut: detectron2.batch_size)
+
+        Returns:
+            List[DetectionResult]: Un résultat par image, dans l'ordre
+        """
+        batch_size = max(1, batch_size or self.batch_size)
+        batches = [
+            images[start : start + batch_size]
+            for start in range(0, len(images), batch_size)
+        ]
+        results: List[DetectionResult] = []
+        if not batches:
+            return results
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._prepare_batch_inputs, batches[0])
+            for index, batch in enumerate(batches):
+                start_time = time.time()
+                current = pending
+                if index + 1 < len(batches):
+                    pending = executor.submit(
+                        self._prepare_batch_inputs, batches[index + 1]
+                    )
+
+                try:
+                    inputs = current.result()
+                    with torch.inference_mode():
+                        outputs = self.predictor.model(inputs)
+
+                    batch_time = time.time() - start_time
+                    device = str(self.cfg.MODEL.DEVICE)
+                    for output in outputs:
+                        instances = output["instances"]
+                        performance_metrics = {
+                            "inference_time_ms": batch_time * 1000 / len(batch),
+                            "batch_inference_time_ms": batch_time * 1000,
+                            "batch_size": len(batch),
+                            "detections_count": len(instances),
+                            "device": device,
+                        }
+                        self._update_global_metrics(
+                            batch_time / len(batch), len(instances)
+                        )
+                        results.append(
+                            DetectionResult(
+                                instances, self.metadata, performance_metrics
+                            )
+                        )
+
+                    self.logger.info(
+                        f"Lot de {len(batch)} images traité en {batch_time*1000:.1f}ms"
+                    )
+
+                except Exception as e:
+                    self.logger.error(f"Erreur détection par lot: {e}")
+                    results.extend(
+                        DetectionResult(None, self.metadata, {"error": str(e)})
+                        for _ in batch
+                    )
+
+        return results
+
+    def _prepare_batch_inputs(
+        self, images: Sequence[Union[np.ndarray, str, Path]]
+    ) -> List[Dict[str, Any]]:
+        """Prépare un lot au format d'entrée du modèle (comme DefaultPredictor)"""
+        inputs = []
+        for image in images:
+            original_image = self._prepare_image(image)
+            height, width = original_image.shape[:2]
+            resized = self.predictor.aug.get_transform(original_image).apply_image(
+                original_image
+            )
+            tensor = self._to_model_tensor(resized)
+            inputs.append({"image": tensor, "height": height, "width": width})
+        return inputs
+
+    def _to_model_tensor(self, image: np.ndarray) -> torch.Tensor:
+        """Convertit une image HWC en tenseur CHW float32 sur le device du modèle"""
+        device = torch.device(self.cfg.MODEL.DEVICE)
+        if device.type != "cuda":
+            return torch.as_tensor(image.astype("float32").transpose(2, 0, 1))
+
+        # GPU : l'image uint8 (4x moins d'octets que du float32) est copiée dans
+        # un tampon épinglé puis transférée sans bloquer ; la conversion CHW
+        # float32 se fait ensuite sur le GPU
+        host = torch.from_numpy(np.ascontiguousarray(image))
+        key = tuple(host.shape) + (host.dtype,)
+        with self._pinned_lock:
+            entry = self._pinned_buffers.pop(key, None)
+            if entry is None:
+                buffer = torch.empty(host.shape, dtype=host.dtype, pin_memory=True)
+            else:
+                buffer, copy_done = entry
+                # Le transfert précédent depuis ce tampon doit être terminé
+                copy_done.synchronize()
+
+            buffer.copy_(host)
+            tensor = buffer.to(device, non_blocking=True)
+            copy_done = torch.cuda.Event()
+            copy_done.record()
+
+            self._pinned_buffers[key] = (buffer, copy_done)
+            while len(self._pinned_buffers) > _PINNED_BUFFER_SLOTS:
+                self._pinned_buffers.popitem(last=False)
+
+        return tensor.permute(2, 0, 1).float()
+
     def switch_task(self, new_task: str):
         """Change le type de tâche dynamiquement"""
         if new_task == self.task_type:
@@ -249,6 +394,7 @@ class UniversalDetector:
 
         self.task_type = new_task
         self._setup_model_config()
+        self._input_format = self.cfg.INPUT.FORMAT
         self.predictor = DefaultPredictor(self.cfg)
         self.metadata = MetadataCatalog.get(self.cfg.DATASETS.TRAIN[0])
 
@@ -290,10 +436,15 @@ class UniversalDetector:
         if not isinstance(image, np.ndarray):
             raise ValueError(f"Type d'image non supporté: {type(image)}")
 
-        # Conversion BGR vers RGB si nécessaire
-        if len(image.shape) == 3 and image.shape[2] == 3:
-            # Detectron2 attend RGB
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        # OpenCV fournit du BGR : conversion uniquement si le modèle attend du
+        # RGB. La vue inversée évite une copie ; _to_model_tensor rend le
+        # tableau contigu lorsque c'est nécessaire
+        if (
+            self._input_format == "RGB"
+            and len(image.shape) == 3
+            and image.shape[2] == 3
+        ):
+            image = image[:, :, ::-1]
 
         return image
 
@@ -328,6 +479,8 @@ class UniversalDetector:
         """Nettoyage des ressources"""
         if self.predictor:
             del self.predictor
+        with self._pinned_lock:
+            self._pinned_buffers.clear()
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
 
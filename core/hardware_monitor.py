@@ -9,9 +9,10 @@ Monitoring hardware temps réel pour optimisation IA
 
 import psutil
 import platform
-import time
 import threading
 import json
+from collections import deque
+from itertools import islice
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -31,10 +32,11 @@ class HardwareMonitor:
     def __init__(self):
         self.logger = Logger("HardwareMonitor")
         self.monitoring = False
-        self.data_history = []
         self.max_history = 100
+        self.data_history = deque(maxlen=self.max_history)
         self.update_interval = 1.0
         self.monitor_thread = None
+        self._stop_event = threading.Event()
 
     def get_system_info(self) -> Dict[str, Any]:
         """Informations système complètes"""
@@ -299,24 +301,23 @@ class HardwareMonitor:
 
         self.monitoring = True
         self.update_interval = interval
+        self._stop_event.clear()
 
         def monitor_loop():
-            while self.monitoring:
+            while True:
                 try:
                     data = self.get_complete_info()
                     data["performance"] = self.calculate_ai_performance_score()
 
+                    # deque bornée : les plus anciennes entrées sont évincées
                     self.data_history.append(data)
 
-                    # Limiter l'historique
-                    if len(self.data_history) > self.max_history:
-                        self.data_history.pop(0)
-
-                    time.sleep(self.update_interval)
-
                 except Exception as e:
                     self.logger.error(f"Erreur monitoring: {e}")
-                    time.sleep(self.update_interval)
+
+                # Attente interruptible : stop_monitoring réveille le thread
+                if self._stop_event.wait(self.update_interval):
+                    break
 
         self.monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
         self.monitor_thread.start()
@@ -326,6 +327,7 @@ class HardwareMonitor:
     def stop_monitoring(self):
         """Arrête le monitoring"""
         self.monitoring = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=2)
         self.logger.info("Monitoring hardware arrêté")
@@ -336,13 +338,14 @@ class HardwareMonitor:
 
     def get_history(self, limit: int = 50) -> list:
         """Récupère l'historique des données"""
-        return self.data_history[-limit:] if self.data_history else []
+        start = max(0, len(self.data_history) - limit)
+        return list(islice(self.data_history, start, None))
 
     def export_data(self, filepath: str):
         """Exporte les données vers un fichier JSON"""
         try:
             with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(self.data_history, f, indent=2, ensure_ascii=False)
+                json.dump(list(self.data_history), f, indent=2, ensure_ascii=False)
             self.logger.info(f"Données exportées vers {filepath}")
         except Exception as e:
             self.logger.error(f"Erreur export: {e}")
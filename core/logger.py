@@ -91,6 +91,10 @@ class Logger:
             message: Message principal
             extra: Données supplémentaires à logger
         """
+        # Niveau filtré : ne pas formater les données supplémentaires
+        if not self.logger.isEnabledFor(level):
+            return
+
         if extra:
             # Formater les données supplémentaires
             extra_str = " | ".join([f"{k}={v}" for k, v in extra.items()])
@@ -109,6 +113,9 @@ class Logger:
             duration_ms: Durée en millisecondes
             **kwargs: Métriques supplémentaires
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         metrics = {
             "operation": operation,
             "duration_ms": f"{duration_ms:.2f}",
@@ -126,6 +133,10 @@ class Logger:
             duration_ms: Durée de détection
             **kwargs: Métriques supplémentaires
         """
+        # Appelé à chaque détection : rien à construire si INFO est filtré
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         metrics = {
             "task": task_type,
             "detections": count,
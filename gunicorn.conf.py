@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AIMER PRO - Configuration Gunicorn
+© 2025 - Licence Apache 2.0
+
+Configuration de production chargée automatiquement par `gunicorn app:app`
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Flask-SocketIO garde l'état des sessions en mémoire : sans sticky sessions
+# un seul worker est possible, la montée en charge se fait par les threads.
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", multiprocessing.cpu_count() * 2))
+
+timeout = 120
+keepalive = 5
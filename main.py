@@ -203,6 +203,39 @@ def get_venv_python():
     return str(venv_path) if venv_path.exists() else None
 
 
+def get_unmet_requirements(specs):
+    """Filtre les spécifications pip déjà satisfaites dans l'environnement courant"""
+    import re
+    from importlib import metadata
+
+    def normalize(name):
+        return re.sub(r"[-_.]+", "-", name).lower()
+
+    # Lecture unique des métadonnées installées, sans lancer pip
+    installed = {}
+    for dist in metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            installed[normalize(name)] = dist.version
+
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        Requirement = None
+
+    unmet = []
+    for spec in specs:
+        name = re.split(r"[<>=!~;\[\s]", spec, maxsplit=1)[0]
+        version = installed.get(normalize(name))
+        if version is None:
+            unmet.append(spec)
+        elif Requirement is not None and not Requirement(spec).specifier.contains(
+            version, prereleases=True
+        ):
+            unmet.append(spec)
+    return unmet
+
+
 def auto_setup(auto_fix=False):
     logger = setup_logging()
     # 1. Vérifie le venv
@@ -262,9 +295,7 @@ def auto_setup(auto_fix=False):
                 pkg = line.split()[0]
                 pkgs.append(pkg)
         # Vérifie si tout est installé
-        import pkg_resources
-        installed = {pkg.key for pkg in pkg_resources.working_set}
-        to_install = [p for p in pkgs if p.lower().split('==')[0] not in installed]
+        to_install = get_unmet_requirements(pkgs)
         if to_install:
             logger.warning("Installation des dépendances requirements_stable.txt : %s", ', '.join(to_install))
             print(f"[AUTO-SETUP] Installation des dépendances requirements_stable.txt : {', '.join(to_install)}")
@@ -282,10 +313,15 @@ def auto_setup(auto_fix=False):
         logger.warning("Dépendances critiques manquantes : %s", ', '.join(missing))
         print(f"[AUTO-SETUP] Dépendances critiques manquantes : {', '.join(missing)}")
         if auto_fix or (input("Installer automatiquement les dépendances critiques manquantes ? [O/n] ").strip().lower() in ('', 'o', 'y', 'yes')):
-            for pkg in missing:
-                logger.info("Installation de la dépendance critique : %s", pkg)
-                print(f"[AUTO-SETUP] pip install {pkg}")
-                subprocess.run([sys.executable, '-m', 'pip', 'install', pkg], check=True)
+            # Une seule invocation pip : résolution des dépendances faite une fois
+            logger.info("Installation des dépendances critiques : %s", ', '.join(missing))
+            print(f"[AUTO-SETUP] pip install {' '.join(missing)}")
+            subprocess.run(
+                [sys.executable, '-m', 'pip', 'install',
+                 '--disable-pip-version-check', '--no-input', '--prefer-binary',
+                 *missing],
+                check=True,
+            )
             logger.info("Dépendances critiques installées. Relance automatique...")
             print("[AUTO-SETUP] Relance automatique après installation...")
             os.execv(sys.executable, [sys.executable] + sys.argv)
@@ -359,12 +395,20 @@ def auto_fix_environment():
             # En cas d'erreur, essayer l'installation basique
             print("🔄 Tentative d'installation des packages essentiels...")
             essential_packages = ["flask", "flask-socketio", "opencv-python", "pillow", "numpy", "torch", "torchvision"]
-            for package in essential_packages:
-                try:
-                    subprocess.run([str(pip_venv), "install", package], check=True, capture_output=True)
+            pip_args = [str(pip_venv), "install", "--disable-pip-version-check", "--no-input"]
+            try:
+                # Un seul appel pip pour tous les packages essentiels
+                subprocess.run(pip_args + essential_packages, check=True, capture_output=True)
+                for package in essential_packages:
                     print(f"  ✅ {package}")
-                except:
-                    print(f"  ❌ {package}")
+            except subprocess.CalledProcessError:
+                # Repli paquet par paquet pour isoler ceux qui échouent
+                for package in essential_packages:
+                    try:
+                        subprocess.run(pip_args + [package], check=True, capture_output=True)
+                        print(f"  ✅ {package}")
+                    except subprocess.CalledProcessError:
+                        print(f"  ❌ {package}")
     else:
         print(f"⚠️  Fichier {requirements_file.name} introuvable")
     